@@ -0,0 +1,134 @@
+"""
+Redis Encoding Benchmark
+Compares memory use and throughput of the row encodings in redis_storage.py.
+
+Usage:
+    python bench_redis_encoding.py [row_count]
+
+Writes synthetic orders under the bench_order:* prefix and removes them
+when done; the seeded sample tables are not touched.
+"""
+
+import os
+import sys
+import time
+import random
+from dotenv import load_dotenv
+import redis
+import redis_storage
+from redis_storage import ENCODINGS, TABLES, clear_table, read_row, read_rows, write_rows
+
+# Fix Windows console encoding
+if sys.platform == 'win32':
+    sys.stdout.reconfigure(encoding='utf-8')
+
+load_dotenv()
+
+redis_client = redis.Redis(
+    host=os.getenv("REDIS_HOST", "localhost"),
+    port=int(os.getenv("REDIS_PORT", 6379)),
+    password=os.getenv("REDIS_PASSWORD", None),
+    db=int(os.getenv("REDIS_DB", 0)),
+    decode_responses=True
+)
+
+BENCH_TABLE = "bench_orders"
+TABLES[BENCH_TABLE] = {"prefix": "bench_order", "fields": TABLES["orders"]["fields"]}
+
+STATUSES = ["completed", "shipped", "processing", "pending"]
+
+
+def make_orders(count: int) -> list:
+    """Generate synthetic orders shaped like seed_data.ORDERS."""
+    return [
+        {
+            "id": str(i),
+            "user_id": str(random.randint(1, 100000)),
+            "product_id": str(random.randint(1, 5000)),
+            "quantity": str(random.randint(1, 5)),
+            "status": random.choice(STATUSES),
+            "order_date": f"2024-{random.randint(1, 12):02d}-{random.randint(1, 28):02d}"
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def table_memory() -> int:
+    """Sum of MEMORY USAGE over every key of the benchmark table."""
+    prefix = TABLES[BENCH_TABLE]["prefix"]
+    keys = list(redis_client.scan_iter(match=f"{prefix}:*", count=1000))
+    total = 0
+    for i in range(0, len(keys), 1000):
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys[i:i + 1000]:
+            pipe.memory_usage(key, samples=0)
+        total += sum(usage or 0 for usage in pipe.execute())
+    return total
+
+
+def bench_encoding(encoding: str, orders: list) -> dict:
+    """Write, measure and read back the orders in one encoding."""
+    clear_table(redis_client, BENCH_TABLE)
+    used_before = redis_client.info("memory")["used_memory"]
+
+    start = time.perf_counter()
+    used = write_rows(redis_client, BENCH_TABLE, orders, encoding)
+    write_secs = time.perf_counter() - start
+    sample_key = next(redis_client.scan_iter(match=f"{TABLES[BENCH_TABLE]['prefix']}:*", count=1000))
+
+    used_after = redis_client.info("memory")["used_memory"]
+    memory = table_memory()
+
+    start = time.perf_counter()
+    rows = read_rows(redis_client, BENCH_TABLE)
+    scan_secs = time.perf_counter() - start
+    assert len(rows) == len(orders), f"{encoding}: read {len(rows)} of {len(orders)} rows"
+
+    sample = random.sample(orders, min(1000, len(orders)))
+    start = time.perf_counter()
+    for order in sample:
+        read_row(redis_client, BENCH_TABLE, order["id"])
+    lookup_secs = time.perf_counter() - start
+
+    return {
+        "encoding": used,
+        "object_encoding": redis_client.object("encoding", sample_key),
+        "keys": len(list(redis_client.scan_iter(match=f"{TABLES[BENCH_TABLE]['prefix']}:*", count=1000))),
+        "memory_usage": memory,
+        "used_memory_delta": used_after - used_before,
+        "write_rows_per_sec": len(orders) / write_secs,
+        "scan_rows_per_sec": len(orders) / scan_secs,
+        "lookups_per_sec": len(sample) / lookup_secs
+    }
+
+
+def run_benchmark(count: int):
+    print(f"[BENCH] Comparing row encodings with {count} orders "
+          f"(bucket size {redis_storage.BUCKET_SIZE})...")
+    try:
+        redis_client.ping()
+    except redis.ConnectionError as e:
+        print(f"[ERROR] Failed to connect to Redis: {e}")
+        return
+
+    orders = make_orders(count)
+    results = {}
+    try:
+        for encoding in ENCODINGS:
+            print(f"   Running '{encoding}'...")
+            results[encoding] = bench_encoding(encoding, orders)
+    finally:
+        clear_table(redis_client, BENCH_TABLE)
+
+    print(f"\n{'encoding':<18}{'OBJECT ENCODING':>16}{'keys':>10}{'MEMORY USAGE':>15}{'bytes/row':>11}"
+          f"{'used delta':>13}{'write/s':>11}{'scan/s':>11}{'lookup/s':>11}")
+    for encoding, r in results.items():
+        label = encoding if r["encoding"] == encoding else f"{encoding}->{r['encoding']}"
+        print(f"{label:<18}{r['object_encoding']:>16}{r['keys']:>10}{r['memory_usage']:>15}"
+              f"{r['memory_usage'] / count:>11.1f}{r['used_memory_delta']:>13}"
+              f"{r['write_rows_per_sec']:>11.0f}{r['scan_rows_per_sec']:>11.0f}"
+              f"{r['lookups_per_sec']:>11.0f}")
+
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
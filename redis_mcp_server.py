@@ -5,10 +5,14 @@ A Model Context Protocol server that enables AI agents to interact with Redis da
 
 import os
 import json
+import time
 from typing import Any
 from dotenv import load_dotenv
 import redis
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
 from mcp.server.fastmcp import FastMCP
+from redis_storage import TABLES, read_row, read_rows
 
 # Load environment variables
 load_dotenv()
@@ -22,33 +26,117 @@ REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
 
+# Hashes above either threshold are returned in HSCAN pages by redis_hgetall
+HGETALL_STREAM_FIELDS = int(os.getenv("REDIS_HGETALL_STREAM_FIELDS", 1000))
+HGETALL_STREAM_BYTES = int(os.getenv("REDIS_HGETALL_STREAM_BYTES", 1024 * 1024))
+# Most HSCAN calls per page, so a sparse MATCH can't walk the whole hash at once
+HSCAN_MAX_CALLS = int(os.getenv("REDIS_HSCAN_MAX_CALLS", 10))
+
+# Connection pool configuration
+REDIS_SOCKET_PATH = os.getenv("REDIS_SOCKET_PATH", None)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 20))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 2))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+REDIS_RETRIES = int(os.getenv("REDIS_RETRIES", 3))
+
+
+def create_connection_pool() -> redis.BlockingConnectionPool:
+    """
+    Create a bounded connection pool for the Redis client.
+    
+    Callers wait up to REDIS_POOL_TIMEOUT for a free connection instead of
+    opening unbounded new ones. Idle connections are pinged before reuse
+    after REDIS_HEALTH_CHECK_INTERVAL seconds, and commands failing with a
+    connection or timeout error are retried with exponential backoff on a
+    fresh connection. Set REDIS_SOCKET_PATH to connect over a Unix socket.
+    """
+    options = {
+        "password": REDIS_PASSWORD,
+        "db": REDIS_DB,
+        "decode_responses": True,
+        "max_connections": REDIS_MAX_CONNECTIONS,
+        "timeout": REDIS_POOL_TIMEOUT,
+        "socket_timeout": REDIS_SOCKET_TIMEOUT,
+        "health_check_interval": REDIS_HEALTH_CHECK_INTERVAL,
+        "retry": Retry(ExponentialBackoff(cap=1, base=0.05), REDIS_RETRIES),
+        "retry_on_error": [redis.ConnectionError, redis.TimeoutError]
+    }
+    if REDIS_SOCKET_PATH:
+        return redis.BlockingConnectionPool(
+            connection_class=redis.UnixDomainSocketConnection,
+            path=REDIS_SOCKET_PATH,
+            **options
+        )
+    return redis.BlockingConnectionPool(
+        host=REDIS_HOST,
+        port=REDIS_PORT,
+        socket_connect_timeout=REDIS_CONNECT_TIMEOUT,
+        socket_keepalive=True,
+        **options
+    )
+
+
 # Create Redis client
-redis_client = redis.Redis(
-    host=REDIS_HOST,
-    port=REDIS_PORT,
-    password=REDIS_PASSWORD,
-    db=REDIS_DB,
-    decode_responses=True
-)
+redis_client = redis.Redis(connection_pool=create_connection_pool())
+
+
+def get_pool_stats() -> dict:
+    """Get utilization of the Redis connection pool."""
+    pool = redis_client.connection_pool
+    try:
+        # redis-py has no public pool stats: this reads BlockingConnectionPool
+        # internals (_connections, the pool queue holding idle connections and
+        # None placeholders) and may need updating across redis-py versions.
+        # The queue's own mutex gives a consistent snapshot against
+        # concurrent get_connection/release calls.
+        with pool.pool.mutex:
+            created = len(pool._connections)
+            idle = sum(1 for conn in pool.pool.queue if conn is not None)
+    except Exception as e:
+        return {"max_connections": pool.max_connections, "error": f"Pool stats unavailable: {e}"}
+    return {
+        "max_connections": pool.max_connections,
+        "created": created,
+        "in_use": created - idle,
+        "idle": idle,
+        "utilization": round((created - idle) / pool.max_connections, 3)
+    }
 
 
 def get_connection_status() -> dict:
     """Get Redis connection status."""
+    if REDIS_SOCKET_PATH:
+        endpoint = {"socket": REDIS_SOCKET_PATH}
+    else:
+        endpoint = {"host": REDIS_HOST, "port": REDIS_PORT}
     try:
+        start = time.perf_counter()
         redis_client.ping()
         return {
             "status": "connected",
-            "host": REDIS_HOST,
-            "port": REDIS_PORT,
-            "db": REDIS_DB
+            **endpoint,
+            "db": REDIS_DB,
+            "ping_ms": round((time.perf_counter() - start) * 1000, 2),
+            "pool": get_pool_stats()
         }
-    except redis.ConnectionError as e:
+    except (redis.ConnectionError, redis.TimeoutError) as e:
         return {
             "status": "disconnected",
-            "error": str(e)
+            **endpoint,
+            "error": str(e),
+            "pool": get_pool_stats()
         }
 
 
+def format_error(e: Exception) -> str:
+    """Describe a tool failure, calling out connectivity problems."""
+    if isinstance(e, (redis.ConnectionError, redis.TimeoutError)):
+        return f"Error: Redis unavailable ({type(e).__name__}): {str(e)}"
+    return f"Error: {str(e)}"
+
+
 # ============== MCP TOOLS ==============
 
 @mcp.tool()
@@ -68,7 +156,7 @@ def redis_get(key: str) -> str:
             return f"Key '{key}' does not exist"
         return value
     except Exception as e:
-        return f"Error: {str(e)}"
+        return format_error(e)
 
 
 @mcp.tool()
@@ -91,7 +179,7 @@ def redis_set(key: str, value: str, expire_seconds: int = None) -> str:
             redis_client.set(key, value)
         return f"Successfully set key '{key}'"
     except Exception as e:
-        return f"Error: {str(e)}"
+        return format_error(e)
 
 
 @mcp.tool()
@@ -111,27 +199,92 @@ def redis_delete(key: str) -> str:
             return f"Successfully deleted key '{key}'"
         return f"Key '{key}' does not exist"
     except Exception as e:
-        return f"Error: {str(e)}"
+        return format_error(e)
+
+
+def hash_preflight(key: str) -> tuple:
+    """
+    Get the field count and memory footprint of a hash in one round trip.
+    
+    Returns:
+        Tuple of (HLEN, estimated MEMORY USAGE in bytes or None if unavailable)
+    """
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hlen(key)
+    # Default sampling estimates from a few fields; SAMPLES 0 would read
+    # every field and block Redis on exactly the hashes we want to avoid
+    pipe.memory_usage(key)
+    hlen, memory = pipe.execute(raise_on_error=False)
+    if isinstance(hlen, Exception):
+        raise hlen
+    # MEMORY USAGE may be disabled or renamed on managed Redis
+    if isinstance(memory, Exception):
+        memory = None
+    return hlen, memory
+
+
+def hscan_page(key: str, cursor: int, match: str, count: int) -> tuple:
+    """
+    Collect up to roughly `count` fields from a hash with HSCAN.
+    
+    Stops after HSCAN_MAX_CALLS calls even if fewer fields matched, so a
+    page may be short (or empty) while the scan is still incomplete.
+    
+    Returns:
+        Tuple of (next cursor, fields); a next cursor of 0 means the scan is complete
+    """
+    fields = {}
+    for _ in range(HSCAN_MAX_CALLS):
+        cursor, data = redis_client.hscan(key, cursor=cursor, match=match, count=count)
+        fields.update(data)
+        if cursor == 0 or len(fields) >= count:
+            break
+    return cursor, fields
 
 
 @mcp.tool()
-def redis_hgetall(key: str) -> str:
+def redis_hgetall(key: str, cursor: int = 0, match: str = "*", count: int = 1000, stream: bool = None) -> str:
     """
     Get all fields and values of a hash stored at key.
     
+    Large hashes (or any request with a cursor, match pattern or stream=True)
+    are read incrementally with HSCAN. Each page returns a cursor; pass it
+    back to continue until "complete" is true; pages can be short or empty
+    before then when a MATCH pattern is sparse.
+    
     Args:
         key: The Redis hash key
+        cursor: Continuation cursor from a previous page (default: 0 to start)
+        match: Only return fields matching this pattern (default: "*")
+        count: Approximate number of fields per page (default: 1000)
+        stream: Force paging on or off (default: chosen from the hash size)
     
     Returns:
-        JSON string of all hash fields and values
+        JSON string of all hash fields and values, or of one page when streaming
     """
     try:
-        data = redis_client.hgetall(key)
-        if not data:
-            return f"Hash '{key}' does not exist or is empty"
-        return json.dumps(data, indent=2)
+        total_fields = None
+        if cursor == 0 and match == "*" and stream is not True:
+            total_fields, memory = hash_preflight(key)
+            if not total_fields:
+                return f"Hash '{key}' does not exist or is empty"
+            too_large = (total_fields > HGETALL_STREAM_FIELDS
+                         or (memory or 0) > HGETALL_STREAM_BYTES)
+            if stream is False or not too_large:
+                return json.dumps(redis_client.hgetall(key), indent=2)
+        
+        next_cursor, fields = hscan_page(key, cursor, match, count)
+        page = {
+            "key": key,
+            "fields": fields,
+            "cursor": next_cursor,
+            "complete": next_cursor == 0
+        }
+        if total_fields is not None:
+            page["total_fields"] = total_fields
+        return json.dumps(page, indent=2)
     except Exception as e:
-        return f"Error: {str(e)}"
+        return format_error(e)
 
 
 @mcp.tool()
@@ -151,7 +304,7 @@ def redis_hset(key: str, field: str, value: str) -> str:
         redis_client.hset(key, field, value)
         return f"Successfully set field '{field}' in hash '{key}'"
     except Exception as e:
-        return f"Error: {str(e)}"
+        return format_error(e)
 
 
 @mcp.tool()
@@ -169,7 +322,7 @@ def redis_keys(pattern: str = "*") -> str:
         keys = redis_client.keys(pattern)
         return json.dumps(keys, indent=2)
     except Exception as e:
-        return f"Error: {str(e)}"
+        return format_error(e)
 
 
 @mcp.tool()
@@ -211,31 +364,44 @@ def redis_query_table(table_name: str) -> str:
     Returns:
         JSON array of all entries in the table
     """
-    table_patterns = {
-        "users": "user:*",
-        "products": "product:*",
-        "orders": "order:*"
-    }
-    
-    if table_name not in table_patterns:
+    if table_name not in TABLES:
         return f"Unknown table '{table_name}'. Available tables: users, products, orders"
     
     try:
-        pattern = table_patterns[table_name]
-        keys = redis_client.keys(pattern)
+        results = read_rows(redis_client, table_name)
         
-        if not keys:
+        if not results:
             return f"No entries found in table '{table_name}'. Run seed_data.py to populate sample data."
         
-        results = []
-        for key in sorted(keys):
-            data = redis_client.hgetall(key)
-            data["_key"] = key
-            results.append(data)
-        
         return json.dumps(results, indent=2)
     except Exception as e:
-        return f"Error: {str(e)}"
+        return format_error(e)
+
+
+@mcp.tool()
+def redis_get_row(table_name: str, row_id: str) -> str:
+    """
+    Get a single entry from a sample table by id.
+    
+    Works with any storage encoding used by seed_data.py (hash, packed or bucket).
+    
+    Args:
+        table_name: Name of the table (users, products, or orders)
+        row_id: The entry's id
+    
+    Returns:
+        JSON object of the entry
+    """
+    if table_name not in TABLES:
+        return f"Unknown table '{table_name}'. Available tables: users, products, orders"
+    
+    try:
+        row = read_row(redis_client, table_name, row_id)
+        if row is None:
+            return f"No entry with id '{row_id}' in table '{table_name}'"
+        return json.dumps(row, indent=2)
+    except Exception as e:
+        return format_error(e)
 
 
 @mcp.tool()
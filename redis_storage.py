@@ -0,0 +1,252 @@
+"""
+Redis Row Storage
+Reads and writes sample table rows in Redis using one of several encodings.
+
+Encodings:
+    hash:   one Redis hash per row (user:1 -> {id, name, ...})
+    packed: one string per row holding a JSON array of values in the
+            table's field order (user:1 -> ["1","Alice",...])
+    bucket: packed rows grouped BUCKET_SIZE per hash so each bucket stays
+            listpack-encoded (user:b:0 -> {1: ["1","Alice",...], ...})
+
+Redis only keeps a hash listpack-encoded while it has at most
+hash-max-listpack-entries fields and every value is at most
+hash-max-listpack-value bytes (128 and 64 by default). Past either limit a
+bucket converts to a full hashtable and the saving is lost, so a table
+whose packed rows are wider than the server's value limit is written as
+packed instead of bucket. When rows are added to an existing bucket table,
+any row that would be too wide is skipped instead, because the table's
+layout can't change for one row.
+
+Rows in a bucket share a key, so Redis can't expire them one by one. A
+bucketed row written with a TTL carries its expiry time as an extra
+trailing element, and readers treat it as missing once that time passes.
+
+The encoding and field order of each table are recorded in a _meta:<table>
+hash, so readers decode whichever layout the table was written with.
+Writers that don't name an encoding follow the recorded layout.
+"""
+
+import json
+import time
+from typing import Dict, List, Optional
+
+ENCODINGS = ("hash", "packed", "bucket")
+
+# Rows per bucket hash; keep below hash-max-listpack-entries (default 128)
+BUCKET_SIZE = 100
+
+# Redis default for hash-max-listpack-value, used when CONFIG GET is unavailable
+LISTPACK_VALUE_DEFAULT = 64
+
+# listpack_value_limit results per client, so writes don't each run CONFIG GET
+_value_limits = {}
+
+TABLES = {
+    "users": {
+        "prefix": "user",
+        "fields": ["id", "name", "email", "role", "created"]
+    },
+    "products": {
+        "prefix": "product",
+        "fields": ["id", "name", "price", "category", "stock"]
+    },
+    "orders": {
+        "prefix": "order",
+        "fields": ["id", "user_id", "product_id", "quantity", "status", "order_date"]
+    }
+}
+
+
+def meta_key(table_name: str) -> str:
+    """Key of the hash describing how a table is stored."""
+    return f"_meta:{table_name}"
+
+
+def bucket_key(prefix: str, row_id) -> str:
+    """Key of the bucket hash holding a row in the bucket encoding."""
+    return f"{prefix}:b:{int(row_id) // BUCKET_SIZE}"
+
+
+def pack_row(row: Dict[str, str], fields: List[str], expires_at: Optional[int] = None) -> str:
+    """Pack a row's values into a compact JSON array in field order,
+    followed by its expiry time (epoch seconds) if it has one."""
+    values = [row.get(f, "") for f in fields]
+    if expires_at is not None:
+        values.append(expires_at)
+    return json.dumps(values, separators=(",", ":"))
+
+
+def unpack_row(value: str, fields: List[str]) -> Optional[Dict[str, str]]:
+    """Inverse of pack_row. Returns None if the row has expired."""
+    values = json.loads(value)
+    if len(values) > len(fields) and values[len(fields)] <= time.time():
+        return None
+    return dict(zip(fields, values))
+
+
+def get_layout(client, table_name: str) -> tuple:
+    """
+    Get how a table is stored.
+
+    Returns:
+        Tuple of (encoding, fields); tables without metadata are plain hashes
+    """
+    meta = client.hgetall(meta_key(table_name))
+    if not meta:
+        return "hash", TABLES[table_name]["fields"]
+    return meta["encoding"], json.loads(meta["fields"])
+
+
+def clear_table(client, table_name: str) -> int:
+    """Delete every key of a table in any encoding, plus its metadata."""
+    prefix = TABLES[table_name]["prefix"]
+    deleted = 0
+    batch = []
+    for key in client.scan_iter(match=f"{prefix}:*", count=1000):
+        batch.append(key)
+        if len(batch) >= 1000:
+            deleted += client.unlink(*batch)
+            batch = []
+    if batch:
+        deleted += client.unlink(*batch)
+    client.delete(meta_key(table_name))
+    return deleted
+
+
+def listpack_value_limit(client) -> int:
+    """Largest hash value (in bytes) the server keeps listpack-encoded."""
+    if id(client) in _value_limits:
+        return _value_limits[id(client)]
+    limit = LISTPACK_VALUE_DEFAULT
+    # Redis < 7 calls it hash-max-ziplist-value; managed Redis may disable CONFIG
+    for name in ("hash-max-listpack-value", "hash-max-ziplist-value"):
+        try:
+            config = client.config_get(name)
+        except Exception:
+            break
+        if config:
+            limit = int(next(iter(config.values())))
+            break
+    _value_limits[id(client)] = limit
+    return limit
+
+
+def write_rows(client, table_name: str, rows: List[Dict[str, str]],
+               encoding: Optional[str] = None, ttl: Optional[int] = None,
+               layout: Optional[tuple] = None) -> str:
+    """
+    Write rows to Redis using a pipeline.
+
+    Args:
+        client: Redis client
+        table_name: Table the rows belong to
+        rows: Rows as dicts of field -> string value
+        encoding: Layout to write the table in, recorded in _meta; None
+            keeps the table's recorded layout (plain hashes if it has none)
+        ttl: Optional expiry in seconds for each row. Hash and packed rows
+            expire with their key; bucketed rows carry their expiry time
+        layout: The table's (encoding, fields) if the caller already has it
+
+    Returns:
+        The encoding used, which is "packed" when "bucket" was requested but
+        a packed row is wider than the server's listpack value limit
+    """
+    prefix = TABLES[table_name]["prefix"]
+    explicit = encoding is not None
+    if explicit:
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding '{encoding}'. Available encodings: {', '.join(ENCODINGS)}")
+        fields = TABLES[table_name]["fields"]
+    else:
+        encoding, fields = layout or get_layout(client, table_name)
+
+    expires_at = int(time.time()) + ttl if ttl and encoding == "bucket" else None
+    if encoding == "bucket":
+        limit = listpack_value_limit(client)
+        fits = [len(pack_row(row, fields, expires_at).encode()) <= limit for row in rows]
+        if not all(fits):
+            if explicit:
+                encoding = "packed"
+                expires_at = None
+            else:
+                rows = [row for row, ok in zip(rows, fits) if ok]
+
+    pipe = client.pipeline(transaction=False)
+    if explicit:
+        pipe.hset(meta_key(table_name), mapping={"encoding": encoding, "fields": json.dumps(fields)})
+    for i, row in enumerate(rows, 1):
+        key = f"{prefix}:{row['id']}"
+        if encoding == "hash":
+            pipe.delete(key)
+            pipe.hset(key, mapping=row)
+        elif encoding == "packed":
+            pipe.set(key, pack_row(row, fields))
+        else:
+            pipe.hset(bucket_key(prefix, row["id"]), row["id"], pack_row(row, fields, expires_at))
+        if ttl and encoding != "bucket":
+            pipe.expire(key, ttl)
+        if i % 1000 == 0:
+            pipe.execute()
+    pipe.execute()
+    return encoding
+
+
+def queue_read_row(pipe, table_name: str, row_id: str, layout: tuple) -> None:
+    """Queue the command reading one row on a pipeline; decode with decode_row."""
+    prefix = TABLES[table_name]["prefix"]
+    encoding, _ = layout
+    if encoding == "hash":
+        pipe.hgetall(f"{prefix}:{row_id}")
+    elif encoding == "packed":
+        pipe.get(f"{prefix}:{row_id}")
+    else:
+        pipe.hget(bucket_key(prefix, row_id), str(row_id))
+
+
+def decode_row(value, layout: tuple) -> Optional[Dict[str, str]]:
+    """Decode the reply to a queue_read_row command. Returns None if missing."""
+    encoding, fields = layout
+    if encoding == "hash":
+        return value or None
+    return unpack_row(value, fields) if value is not None else None
+
+
+def read_row(client, table_name: str, row_id: str, layout: Optional[tuple] = None) -> Optional[Dict[str, str]]:
+    """Read a single row by id, decoding its encoding. Returns None if missing."""
+    layout = layout or get_layout(client, table_name)
+    pipe = client.pipeline(transaction=False)
+    queue_read_row(pipe, table_name, row_id, layout)
+    return decode_row(pipe.execute()[0], layout)
+
+
+def read_rows(client, table_name: str) -> List[Dict[str, str]]:
+    """
+    Read every row of a table, decoding its encoding.
+
+    Returns:
+        Rows sorted by key, each with a "_key" field naming the row's key
+    """
+    prefix = TABLES[table_name]["prefix"]
+    encoding, fields = get_layout(client, table_name)
+    pattern = f"{prefix}:b:*" if encoding == "bucket" else f"{prefix}:*"
+    keys = list(client.scan_iter(match=pattern, count=1000))
+    if not keys:
+        return []
+
+    if encoding == "packed":
+        values = client.mget(keys)
+        rows = [dict(unpack_row(value, fields), _key=key)
+                for key, value in zip(keys, values) if value is not None]
+    else:
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hgetall(key)
+        if encoding == "hash":
+            rows = [dict(row, _key=key) for key, row in zip(keys, pipe.execute()) if row]
+        else:
+            rows = [dict(row, _key=f"{prefix}:{row_id}")
+                    for bucket in pipe.execute()
+                    for row_id, value in bucket.items()
+                    for row in [unpack_row(value, fields)] if row is not None]
+    return sorted(rows, key=lambda row: row["_key"])
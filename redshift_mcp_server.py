@@ -4,13 +4,23 @@ A Model Context Protocol server that enables AI agents to interact with Amazon R
 """
 
 import os
+import re
 import json
+import time
+import uuid
+import random
 import logging
 from typing import Any, List, Dict, Optional
 from dotenv import load_dotenv
 import redshift_connector
 import pandas as pd
 from mcp.server.fastmcp import FastMCP
+from redis_storage import TABLES as CACHE_TABLES, decode_row, get_layout, queue_read_row, write_rows
+
+try:
+    import redis
+except ImportError:  # Redis read-through cache is optional
+    redis = None
 
 # Load environment variables
 load_dotenv()
@@ -29,11 +39,48 @@ REDSHIFT_DATABASE = os.getenv("REDSHIFT_DATABASE", "dev")
 REDSHIFT_USER = os.getenv("REDSHIFT_USER", "awsuser")
 REDSHIFT_PASSWORD = os.getenv("REDSHIFT_PASSWORD", "")
 
+# Redis read-through cache configuration
+REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
+REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
+REDIS_DB = int(os.getenv("REDIS_DB", 0))
+CACHE_TTL = int(os.getenv("REDSHIFT_CACHE_TTL", 300))
+CACHE_MISS_TTL = int(os.getenv("REDSHIFT_CACHE_MISS_TTL", 30))
+CACHE_LOCK_MS = int(os.getenv("REDSHIFT_CACHE_LOCK_MS", 5000))
+# How long a table's Redis encoding (its _meta hash) is trusted before re-reading
+CACHE_LAYOUT_TTL = int(os.getenv("REDSHIFT_CACHE_LAYOUT_TTL", 30))
+
+# Read path configuration: rows per FETCH adapt between the min and max
+# so each batch stays near the target size in bytes and in seconds
+FETCH_SIZE_INITIAL = int(os.getenv("REDSHIFT_FETCH_SIZE_INITIAL", 500))
+FETCH_SIZE_MIN = int(os.getenv("REDSHIFT_FETCH_SIZE_MIN", 100))
+FETCH_SIZE_MAX = int(os.getenv("REDSHIFT_FETCH_SIZE_MAX", 50000))
+# FETCH FORWARD accepts at most 1000 rows on single-node Redshift clusters
+REDSHIFT_FETCH_LIMIT = 1000
+FETCH_TARGET_BYTES = int(os.getenv("REDSHIFT_FETCH_TARGET_BYTES", 4 * 1024 * 1024))
+FETCH_TARGET_SECONDS = float(os.getenv("REDSHIFT_FETCH_TARGET_SECONDS", 0.5))
+# Most rows redshift_query returns per call, bounding the response size
+QUERY_MAX_ROWS = int(os.getenv("REDSHIFT_MAX_ROWS", 10000))
+
+# Schema overview cache lifetime in seconds
+SCHEMA_CACHE_TTL = int(os.getenv("REDSHIFT_SCHEMA_CACHE_TTL", 300))
+
+# Rollup configuration
+ROLLUP_REWRITE = os.getenv("REDSHIFT_ROLLUP_REWRITE", "true").lower() == "true"
+# Stop answering from a Postgres summary table once its last refresh is older
+# than this (0 = no limit); Redshift views are judged by stv_mv_info.is_stale
+ROLLUP_MAX_AGE = int(os.getenv("REDSHIFT_ROLLUP_MAX_AGE", 3600))
+# How long rollup state read from the catalog is trusted before re-checking
+ROLLUP_STATE_TTL = int(os.getenv("REDSHIFT_ROLLUP_STATE_TTL", 60))
+
+def is_local_postgres() -> bool:
+    """If host is localhost and port is 5432, assume local Postgres for testing."""
+    return REDSHIFT_HOST == "localhost" and REDSHIFT_PORT == 5432
+
 def get_connection():
     """Create a connection to Redshift or local Postgres."""
     try:
-        # If host is localhost and port is 5432, assume local Postgres for testing
-        if REDSHIFT_HOST == "localhost" and REDSHIFT_PORT == 5432:
+        if is_local_postgres():
             import psycopg2
             return psycopg2.connect(
                 host=REDSHIFT_HOST,
@@ -54,23 +101,625 @@ def get_connection():
         logger.error(f"Connection error: {e}")
         raise
 
+# ============== READ PATH ==============
+
+# Queries that can be wrapped in a server-side cursor, allowing leading
+# whitespace, comments and opening parentheses
+_CURSOR_SQL = re.compile(r"^(?:\s|--[^\n]*(?:\n|$)|/\*.*?\*/|\()*(select|with|values)\b",
+                         re.IGNORECASE | re.DOTALL)
+
+def _execute(cursor, sql: str, params: Optional[tuple] = None) -> None:
+    """Execute, only passing params when given so literal % signs survive."""
+    if params is None:
+        cursor.execute(sql)
+    else:
+        cursor.execute(sql, params)
+
+def _estimate_row_bytes(rows: List[tuple]) -> int:
+    """Rough in-memory width of a row, sampled from a batch."""
+    sample = rows[:20]
+    total = sum(len(str(value)) + 8 for row in sample for value in row)
+    return max(total // max(len(sample), 1), 1)
+
+def fetch_size_max() -> int:
+    """Largest FETCH size the server accepts."""
+    return FETCH_SIZE_MAX if is_local_postgres() else min(FETCH_SIZE_MAX, REDSHIFT_FETCH_LIMIT)
+
+def next_fetch_size(current: int, rows: List[tuple], elapsed: float) -> int:
+    """
+    Pick the next FETCH size from the last batch's row width and throughput.
+    
+    The size is the smaller of what fits FETCH_TARGET_BYTES and what the
+    observed rows/second delivers in FETCH_TARGET_SECONDS, growing at most
+    4x per batch so early batches stay small and arrive quickly.
+    """
+    by_memory = FETCH_TARGET_BYTES // _estimate_row_bytes(rows)
+    by_time = int(len(rows) / elapsed * FETCH_TARGET_SECONDS) if elapsed > 0 else by_memory
+    return min(max(FETCH_SIZE_MIN, min(by_memory, by_time, current * 4)), fetch_size_max())
+
+def iter_batches(sql: str, params: Optional[tuple] = None, max_rows: int = 0, offset: int = 0):
+    """
+    Run a query and yield its results in batches.
+    
+    SELECT queries are read through a server-side cursor (DECLARE/FETCH),
+    which works the same with either driver, so the client never holds
+    more than one batch. On Postgres rows are produced as they are fetched.
+    On Redshift the leader node materializes the full result when the
+    cursor is opened, so time to first row still includes running the
+    whole query, but client memory stays bounded.
+    
+    Other statements run as before: they must return rows, which are read
+    with fetchmany in the same batches, and their transaction is always
+    rolled back, so nothing is written.
+    
+    Args:
+        sql: The SQL to execute
+        params: Optional query parameters
+        max_rows: Stop after this many rows (default: 0 for no limit)
+        offset: Skip this many rows first (default: 0)
+    
+    Yields:
+        Tuples of (column names, list of row tuples)
+    """
+    if max_rows < 0 or offset < 0:
+        raise ValueError("max_rows and offset must not be negative")
+    sql = sql.strip().rstrip(";")
+    with get_connection() as conn:
+        try:
+            cursor = conn.cursor()
+            if _CURSOR_SQL.match(sql):
+                _execute(cursor, f"DECLARE mcp_read NO SCROLL CURSOR FOR {sql}", params)
+                
+                def fetch(size):
+                    cursor.execute(f"FETCH FORWARD {size} FROM mcp_read")
+                    return cursor.fetchall()
+            else:
+                _execute(cursor, sql, params)
+                if not cursor.description:
+                    raise ValueError("Statement returned no rows; only queries are supported")
+                fetch = cursor.fetchmany
+            
+            fetch_size = min(FETCH_SIZE_INITIAL, fetch_size_max())
+            end = offset + max_rows if max_rows else 0
+            position = 0
+            while True:
+                if end:
+                    fetch_size = min(fetch_size, end - position)
+                start = time.perf_counter()
+                rows = fetch(fetch_size)
+                elapsed = time.perf_counter() - start
+                # Rows before the offset are fetched and dropped batch by batch
+                skip = max(offset - position, 0)
+                position += len(rows)
+                yield [d[0] for d in cursor.description], rows[skip:]
+                if len(rows) < fetch_size or (end and position >= end):
+                    break
+                fetch_size = next_fetch_size(fetch_size, rows, elapsed)
+        finally:
+            # Read-only transaction; also discards the cursor if abandoned early
+            conn.rollback()
+
+def fetch_all(sql: str, params: Optional[tuple] = None, max_rows: int = 0, offset: int = 0) -> tuple:
+    """
+    Run a query through iter_batches and collect the results.
+    
+    Returns:
+        Tuple of (column names, list of row tuples)
+    """
+    columns, rows = [], []
+    for columns, batch in iter_batches(sql, params, max_rows, offset):
+        rows.extend(batch)
+    return columns, rows
+
+# ============== ROLLUPS ==============
+
+# Pre-aggregated rollups over the seeded users/products/orders tables.
+# Each rollup is built as a materialized view on Redshift and as a summary
+# table on local Postgres. A redshift_query whose SQL matches a rollup's
+# defining query (ignoring case, whitespace, ORDER BY and LIMIT) is
+# rewritten to read from the rollup instead.
+ROLLUPS = {
+    "revenue_by_category": {
+        "description": "Revenue, units and order count per product category",
+        "sql": """
+            SELECT p.category, SUM(o.quantity * p.price) AS revenue,
+                   SUM(o.quantity) AS units, COUNT(*) AS order_count
+            FROM orders o
+            JOIN products p ON o.product_id = p.id
+            GROUP BY p.category
+        """,
+        "columns": ["category", "revenue", "units", "order_count"]
+    },
+    "orders_by_status_day": {
+        "description": "Order count and units per order status per day",
+        "sql": """
+            SELECT o.order_date, o.status, COUNT(*) AS order_count,
+                   SUM(o.quantity) AS units
+            FROM orders o
+            GROUP BY o.order_date, o.status
+        """,
+        "columns": ["order_date", "status", "order_count", "units"]
+    },
+    "top_users": {
+        "description": "Order count and revenue per user",
+        "sql": """
+            SELECT u.id AS user_id, u.name, COUNT(o.id) AS order_count,
+                   SUM(o.quantity * p.price) AS revenue
+            FROM users u
+            JOIN orders o ON o.user_id = u.id
+            JOIN products p ON o.product_id = p.id
+            GROUP BY u.id, u.name
+        """,
+        "columns": ["user_id", "name", "order_count", "revenue"]
+    }
+}
+
+# Rollup state read from the catalog: name -> {"refreshed_at", "stale"}
+_rollup_state = {}
+_rollup_state_checked = 0.0
+
+def rollup_table(name: str) -> str:
+    """Name of the view/table backing a rollup."""
+    return f"rollup_{name}"
+
+def _normalize_sql(sql: str) -> str:
+    """Canonical form of a query used for rollup matching."""
+    sql = sql.strip().rstrip(";").strip().lower()
+    sql = re.sub(r"\s+", " ", sql)
+    return re.sub(r"\s*([,()=*])\s*", r"\1", sql)
+
+_ROLLUP_INDEX = {_normalize_sql(r["sql"]): name for name, r in ROLLUPS.items()}
+_TAIL_PATTERN = re.compile(r"^(.*?)( order by .*?)?( limit \d+)?$")
+_ORDER_ITEM_PATTERN = re.compile(r"^(\w+)( asc| desc)?( nulls (?:first|last))?$")
+
+def _rollup_order_by(order_by: str, columns: List[str]) -> Optional[str]:
+    """
+    Check that every ORDER BY item is a bare output column of the rollup
+    (or a select-list position), since that is all the rollup can sort by.
+    
+    Returns:
+        The ORDER BY clause to reuse, or None if it can't be answered
+    """
+    if not order_by:
+        return ""
+    for item in order_by[len(" order by "):].split(","):
+        match = _ORDER_ITEM_PATTERN.match(item.strip())
+        if match is None:
+            return None
+        target = match.group(1)
+        if target.isdigit():
+            if not 1 <= int(target) <= len(columns):
+                return None
+        elif target not in columns:
+            return None
+    return order_by
+
+def load_rollup_state(force: bool = False) -> Dict[str, dict]:
+    """
+    Read which rollups exist and when they were last refreshed.
+    
+    On Redshift, stv_mv_info reports whether each materialized view is stale
+    (AUTO REFRESH runs asynchronously and only after base tables change, so
+    the refresh time says nothing about freshness). On Postgres the refresh
+    time is kept in the summary table's comment. The result is cached for ROLLUP_STATE_TTL
+    seconds so rewriting doesn't add a catalog query to every request.
+    """
+    global _rollup_state, _rollup_state_checked
+    if not force and time.monotonic() - _rollup_state_checked < ROLLUP_STATE_TTL:
+        return _rollup_state
+    
+    tables = {rollup_table(name): name for name in ROLLUPS}
+    placeholders = ", ".join(["%s"] * len(tables))
+    state = {}
+    try:
+        with get_connection() as conn:
+            cursor = conn.cursor()
+            if is_local_postgres():
+                cursor.execute(f"""
+                    SELECT c.relname, obj_description(c.oid, 'pg_class')
+                    FROM pg_catalog.pg_class c
+                    JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+                    WHERE n.nspname = 'public' AND c.relname IN ({placeholders})
+                """, tuple(tables))
+                for table, comment in cursor.fetchall():
+                    refreshed_at = float(comment) if comment and re.fullmatch(r"[\d.]+", comment) else None
+                    state[tables[table]] = {"refreshed_at": refreshed_at, "stale": False}
+            else:
+                cursor.execute(f"""
+                    SELECT TRIM(name), is_stale FROM stv_mv_info
+                    WHERE TRIM(name) IN ({placeholders})
+                """, tuple(tables))
+                for table, is_stale in cursor.fetchall():
+                    state[tables[table]] = {"refreshed_at": None, "stale": str(is_stale).lower() in ("t", "true")}
+            conn.rollback()
+    except Exception as e:
+        logger.warning(f"Could not read rollup state: {e}")
+    
+    _rollup_state, _rollup_state_checked = state, time.monotonic()
+    return state
+
+def rollup_age(name: str) -> Optional[float]:
+    """Seconds since a Postgres summary table was last refreshed, if known."""
+    refreshed_at = _rollup_state.get(name, {}).get("refreshed_at")
+    return None if refreshed_at is None else time.time() - refreshed_at
+
+def rollup_usable(name: str) -> bool:
+    """Whether a rollup exists and is fresh enough to answer queries."""
+    state = load_rollup_state().get(name)
+    if state is None or state["stale"]:
+        return False
+    if not is_local_postgres():
+        return True
+    age = rollup_age(name)
+    return age is not None and (not ROLLUP_MAX_AGE or age <= ROLLUP_MAX_AGE)
+
+def rewrite_with_rollup(sql: str) -> Optional[str]:
+    """
+    Rewrite a query to read from a built rollup if it matches one.
+    
+    Returns:
+        The rewritten SQL, or None if no usable rollup matches
+    """
+    match = _TAIL_PATTERN.match(_normalize_sql(sql))
+    body, order_by, limit = match.group(1), match.group(2) or "", match.group(3) or ""
+    name = _ROLLUP_INDEX.get(body)
+    if name is None:
+        return None
+    # Quoted identifiers don't survive normalization
+    order_by = None if '"' in order_by else _rollup_order_by(order_by, ROLLUPS[name]["columns"])
+    if order_by is None or not rollup_usable(name):
+        return None
+    return f"SELECT * FROM {rollup_table(name)}{order_by}{limit}"
+
+def refresh_rollup(name: str) -> None:
+    """Create the rollup if it is missing, then bring it up to date."""
+    table = rollup_table(name)
+    sql = ROLLUPS[name]["sql"]
+    refreshed_at = time.time()
+    with get_connection() as conn:
+        if is_local_postgres():
+            cursor = conn.cursor()
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} AS {sql} WITH NO DATA")
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"INSERT INTO {table} {sql}")
+            # Persist the refresh time so a restarted server knows the rollup's age
+            cursor.execute(f"COMMENT ON TABLE {table} IS '{refreshed_at}'")
+            conn.commit()
+        else:
+            # Materialized view DDL can't run inside a transaction block
+            conn.autocommit = True
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1 FROM stv_mv_info WHERE TRIM(name) = %s", (table,))
+            if cursor.fetchone():
+                cursor.execute(f"REFRESH MATERIALIZED VIEW {table}")
+            else:
+                cursor.execute(f"CREATE MATERIALIZED VIEW {table} AUTO REFRESH YES AS {sql}")
+    _rollup_state[name] = {"refreshed_at": refreshed_at if is_local_postgres() else None, "stale": False}
+
+# ============== READ-THROUGH CACHE ==============
+
+# The cache reads and writes rows through redis_storage, so it shares the
+# user:*/product:*/order:* keys and whichever encoding seed_data.py chose
+# for each table (CACHE_TABLES is redis_storage.TABLES).
+
+# Redshift columns renamed when cached so cached rows carry the same fields
+# as the rows seed_data.py writes (users.created_at is "created" in Redis)
+CACHE_FIELD_ALIASES = {
+    "users": {"created_at": "created"}
+}
+
+def _miss_key(key: str) -> str:
+    """Key marking an id that doesn't exist in Redshift, so repeated misses
+    don't each reach the warehouse. Kept outside the table's key prefix so
+    table scans never see it."""
+    return f"miss:{key}"
+
+# Compare-and-delete so a loader only releases the lock it still holds
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+_cache_client = None
+
+# Table encodings read from Redis: table -> (checked at, (encoding, fields))
+_layout_cache = {}
+
+# Cache failures fall back to Redshift rather than failing the lookup
+_CACHE_ERRORS = (RuntimeError, redis.RedisError) if redis else (RuntimeError,)
+
+def get_cache_client():
+    """Get the Redis client used for the read-through cache."""
+    global _cache_client
+    if redis is None:
+        raise RuntimeError("The redis package is required for the read-through cache")
+    if _cache_client is None:
+        _cache_client = redis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            password=REDIS_PASSWORD,
+            db=REDIS_DB,
+            decode_responses=True,
+            socket_timeout=2,
+            socket_connect_timeout=2
+        )
+    return _cache_client
+
+def _cache_ttl() -> int:
+    """TTL with jitter so keys warmed together don't all expire together."""
+    return CACHE_TTL + random.randint(0, max(CACHE_TTL // 10, 1))
+
+def _row_to_hash(table_name: str, columns: List[str], row) -> Dict[str, str]:
+    """Convert a result row to Redis hash fields."""
+    aliases = CACHE_FIELD_ALIASES.get(table_name, {})
+    return {aliases.get(col, col): "" if value is None else str(value)
+            for col, value in zip(columns, row)}
+
+def _load_row(table_name: str, row_id: int) -> Optional[Dict[str, str]]:
+    """Fetch a single row by id from Redshift."""
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT * FROM public.{table_name} WHERE id = %s", (row_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return _row_to_hash(table_name, [d[0] for d in cursor.description], row)
+
+def _cache_layout(cache, table_name: str) -> tuple:
+    """The table's Redis encoding, re-read every CACHE_LAYOUT_TTL seconds."""
+    checked_at, layout = _layout_cache.get(table_name, (0.0, None))
+    if layout is None or time.monotonic() - checked_at > CACHE_LAYOUT_TTL:
+        layout = get_layout(cache, table_name)
+        _layout_cache[table_name] = (time.monotonic(), layout)
+    return layout
+
+def _store_row(cache, table_name: str, row_id: int, row: Optional[Dict[str, str]]) -> None:
+    """Populate the cache with a row, or a short-lived miss marker."""
+    if row is None:
+        key = f"{CACHE_TABLES[table_name]['prefix']}:{row_id}"
+        cache.set(_miss_key(key), "1", ex=CACHE_MISS_TTL)
+    else:
+        write_rows(cache, table_name, [row], ttl=_cache_ttl(), layout=_cache_layout(cache, table_name))
+
+def _read_cached(cache, table_name: str, row_id: int) -> tuple:
+    """
+    Read a row in the table's stored encoding and its miss marker in one
+    round trip.
+    
+    Returns:
+        Tuple of (hit, row) where row is None for a cached miss
+    """
+    layout = _cache_layout(cache, table_name)
+    key = f"{CACHE_TABLES[table_name]['prefix']}:{row_id}"
+    pipe = cache.pipeline(transaction=False)
+    queue_read_row(pipe, table_name, str(row_id), layout)
+    pipe.exists(_miss_key(key))
+    value, missing = pipe.execute()
+    row = decode_row(value, layout)
+    if row is not None:
+        return True, row
+    return bool(missing), None
+
+def cached_lookup(table_name: str, row_id: int) -> tuple:
+    """
+    Look up a row by id, reading through Redis to Redshift.
+    
+    Concurrent misses for the same key are collapsed: one caller takes a
+    short Redis lock and loads the row while the others wait for the
+    cache to be populated.
+    
+    Returns:
+        Tuple of (row or None, source) where source is "cache" or "redshift"
+    """
+    key = f"{CACHE_TABLES[table_name]['prefix']}:{row_id}"
+    try:
+        cache = get_cache_client()
+        hit, row = _read_cached(cache, table_name, row_id)
+        if hit:
+            return row, "cache"
+        
+        lock_key = f"lock:{key}"
+        token = uuid.uuid4().hex
+        if cache.set(lock_key, token, nx=True, px=CACHE_LOCK_MS):
+            try:
+                row = _load_row(table_name, row_id)
+                _store_row(cache, table_name, row_id, row)
+                return row, "redshift"
+            finally:
+                cache.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        
+        # Another caller is loading this key; wait for it to land
+        deadline = time.monotonic() + CACHE_LOCK_MS / 1000
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            hit, row = _read_cached(cache, table_name, row_id)
+            if hit:
+                return row, "cache"
+    except _CACHE_ERRORS as e:
+        logger.warning(f"Cache unavailable, reading from Redshift: {e}")
+    return _load_row(table_name, row_id), "redshift"
+
+def warm_cache(table_name: str) -> int:
+    """
+    Sync a whole table from Redshift into Redis using pipelined writes,
+    in the table's stored encoding.
+    
+    Returns:
+        Number of rows written
+    """
+    cache = get_cache_client()
+    layout = get_layout(cache, table_name)
+    count = 0
+    for columns, rows in iter_batches(f"SELECT * FROM public.{table_name}"):
+        data = [_row_to_hash(table_name, columns, row) for row in rows]
+        write_rows(cache, table_name, data, ttl=_cache_ttl(), layout=layout)
+        count += len(rows)
+    return count
+
+# ============== SCHEMA OVERVIEW ==============
+
+# A fixed set of catalog queries describes a whole schema regardless of
+# table count. They run on a plain cursor: pg_catalog queries are
+# leader-node only on Redshift and their results are small.
+_COLUMNS_SQL = """
+    SELECT c.relname AS table_name, a.attname AS column_name,
+           format_type(a.atttypid, a.atttypmod) AS data_type,
+           a.attnotnull AS not_null{redshift_columns}
+    FROM pg_catalog.pg_attribute a
+    JOIN pg_catalog.pg_class c ON a.attrelid = c.oid
+    JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+    WHERE n.nspname = %s AND c.relkind = 'r'
+    AND LEFT(c.relname, 8) <> 'mv_tbl__'
+    AND a.attnum > 0 AND NOT a.attisdropped
+    ORDER BY c.relname, a.attnum
+"""
+
+# Skips empty tables and, for regular users, tables they don't own, so on
+# Redshift it refines the pg_class estimates rather than replacing them
+_REDSHIFT_TABLES_SQL = """
+    SELECT "table" AS table_name, tbl_rows AS row_count, diststyle
+    FROM svv_table_info
+    WHERE schema = %s
+"""
+
+_PG_CLASS_TABLES_SQL = """
+    SELECT c.relname AS table_name, c.reltuples::bigint AS row_count
+    FROM pg_catalog.pg_class c
+    JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+    WHERE n.nspname = %s AND c.relkind = 'r'
+"""
+
+_CONSTRAINTS_SQL = """
+    SELECT c.relname AS table_name, con.contype AS constraint_type,
+           pg_get_constraintdef(con.oid) AS definition
+    FROM pg_catalog.pg_constraint con
+    JOIN pg_catalog.pg_class c ON con.conrelid = c.oid
+    JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+    WHERE n.nspname = %s AND con.contype IN ('p', 'f')
+"""
+
+_KEY_PATTERN = re.compile(r"KEY \((.+?)\)(?: REFERENCES (.+?)\((.+?)\))?", re.IGNORECASE)
+
+# Cached overviews by schema: schema -> (built at, JSON)
+_schema_cache = {}
+
+def _catalog_rows(cursor, sql: str, params: tuple) -> List[Dict[str, Any]]:
+    """Run a catalog query and return rows as dicts."""
+    cursor.execute(sql, params)
+    columns = [d[0] for d in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+def _split_names(names: str) -> List[str]:
+    """Split a constraint's column list, dropping identifier quotes."""
+    return [name.strip().strip('"') for name in names.split(",")]
+
+def build_schema_overview(schema: str) -> Dict[str, Any]:
+    """
+    Describe every table in a schema using a fixed number of catalog queries.
+    
+    Returns:
+        Dict with per-table row counts, column types, keys and a list of
+        foreign-key relationships
+    """
+    redshift = not is_local_postgres()
+    with get_connection() as conn:
+        cursor = conn.cursor()
+        columns = _catalog_rows(cursor, _COLUMNS_SQL.format(
+            redshift_columns=", a.attisdistkey AS dist_key, a.attsortkeyord AS sort_key_order"
+            if redshift else ""
+        ), (schema,))
+        stats = _catalog_rows(cursor, _PG_CLASS_TABLES_SQL, (schema,))
+        if redshift:
+            stats += _catalog_rows(cursor, _REDSHIFT_TABLES_SQL, (schema,))
+        constraints = _catalog_rows(cursor, _CONSTRAINTS_SQL, (schema,))
+        conn.rollback()
+    
+    tables = {}
+    for col in columns:
+        table = tables.setdefault(col["table_name"], {"rows": None, "columns": {}})
+        table["columns"][col["column_name"]] = col["data_type"] + (" not null" if col["not_null"] else "")
+        if col.get("dist_key"):
+            table["dist_key"] = col["column_name"]
+        if col.get("sort_key_order"):
+            table.setdefault("sort_key", []).append((abs(col["sort_key_order"]), col["column_name"]))
+    
+    for table in tables.values():
+        if "sort_key" in table:
+            table["sort_key"] = [name for _, name in sorted(table["sort_key"])]
+    
+    for stat in stats:
+        table = tables.get(stat["table_name"])
+        if table is None:
+            continue
+        # reltuples is -1 on Postgres until the table has been analyzed;
+        # svv_table_info rows come last and override the estimate
+        if stat["row_count"] is not None and stat["row_count"] >= 0:
+            table["rows"] = int(stat["row_count"])
+        if stat.get("diststyle"):
+            table["diststyle"] = stat["diststyle"]
+    
+    relationships = []
+    for con in constraints:
+        table = tables.get(con["table_name"])
+        match = _KEY_PATTERN.search(con["definition"])
+        if table is None or match is None:
+            continue
+        if con["constraint_type"] == "p":
+            table["primary_key"] = _split_names(match.group(1))
+            continue
+        ref_table = match.group(2).split(".")[-1].strip('"')
+        for col, ref_col in zip(_split_names(match.group(1)), _split_names(match.group(3))):
+            table.setdefault("foreign_keys", {})[col] = f"{ref_table}.{ref_col}"
+            relationships.append(f"{con['table_name']}.{col} -> {ref_table}.{ref_col}")
+    
+    return {"schema": schema, "tables": tables, "relationships": sorted(relationships)}
+
 # ============== MCP TOOLS ==============
 
 @mcp.tool()
-def redshift_query(sql: str) -> str:
+def redshift_query(sql: str, use_rollups: bool = True, max_rows: int = None, offset: int = 0) -> str:
     """
     Execute a SQL query on Redshift and return results as JSON.
     
+    At most REDSHIFT_MAX_ROWS rows are returned per call. When a result is
+    cut short, the response is an object with the rows, "truncated": true
+    and a "next_offset" to pass back for the next page (use ORDER BY for
+    stable pages).
+    
     Args:
         sql: The SQL query to execute
+        use_rollups: Answer matching aggregates from a pre-built rollup (default: True)
+        max_rows: Return at most this many rows (default: REDSHIFT_MAX_ROWS)
+        offset: Skip this many rows, to continue a truncated result (default: 0)
     
     Returns:
         JSON string of the query results or error message
     """
+    limit = QUERY_MAX_ROWS if max_rows is None else max_rows
+    if limit < 1 or offset < 0:
+        return "Error executing query: max_rows must be at least 1 and offset must not be negative"
+    limit = min(limit, QUERY_MAX_ROWS)
+    
+    if use_rollups and ROLLUP_REWRITE:
+        rewritten = rewrite_with_rollup(sql)
+        if rewritten:
+            logger.info(f"Answering query from rollup: {rewritten}")
+            sql = rewritten
     try:
-        with get_connection() as conn:
-            df = pd.read_sql(sql, conn)
-            return df.to_json(orient="records", indent=2)
+        # One extra row tells us whether the result was cut short
+        columns, rows = fetch_all(sql, max_rows=limit + 1, offset=offset)
+        truncated = len(rows) > limit
+        df = pd.DataFrame.from_records(rows[:limit], columns=columns, coerce_float=True)
+        records = df.to_json(orient="records", indent=2)
+        if not truncated:
+            return records
+        return json.dumps({
+            "rows": json.loads(records),
+            "truncated": True,
+            "next_offset": offset + limit
+        }, indent=2)
     except Exception as e:
         return f"Error executing query: {str(e)}"
 
@@ -152,6 +801,127 @@ def redshift_connection_status() -> str:
             "error": str(e)
         }, indent=2)
 
+@mcp.tool()
+def redshift_list_rollups() -> str:
+    """
+    List the pre-aggregated rollups and whether they are built.
+    
+    Queries matching a rollup's SQL are answered from the rollup while it is
+    ready: built and not marked stale on Redshift, or refreshed within
+    REDSHIFT_ROLLUP_MAX_AGE seconds for Postgres summary tables.
+    
+    Returns:
+        JSON description of each rollup
+    """
+    load_rollup_state()
+    rollups = {
+        name: {
+            "description": r["description"],
+            "table": rollup_table(name),
+            "sql": " ".join(r["sql"].split()),
+            "ready": rollup_usable(name),
+            "exists": name in _rollup_state,
+            "age_seconds": None if rollup_age(name) is None else round(rollup_age(name))
+        }
+        for name, r in ROLLUPS.items()
+    }
+    return json.dumps(rollups, indent=2)
+
+@mcp.tool()
+def redshift_refresh_rollups(name: str = "") -> str:
+    """
+    Build or refresh pre-aggregated rollups.
+    
+    Args:
+        name: Rollup to refresh (default: "" for all rollups)
+    
+    Returns:
+        JSON status per rollup
+    """
+    if name and name not in ROLLUPS:
+        return f"Unknown rollup '{name}'. Available rollups: {', '.join(ROLLUPS)}"
+    
+    results = {}
+    for rollup in ([name] if name else ROLLUPS):
+        try:
+            refresh_rollup(rollup)
+            results[rollup] = "refreshed"
+            _schema_cache.clear()
+        except Exception as e:
+            _rollup_state.pop(rollup, None)
+            results[rollup] = f"Error: {str(e)}"
+    return json.dumps(results, indent=2)
+
+@mcp.tool()
+def redshift_lookup(table_name: str, row_id: int) -> str:
+    """
+    Look up a single row by id, served from the Redis cache when possible.
+    
+    Args:
+        table_name: Name of the table (users, products, or orders)
+        row_id: Value of the row's id column
+    
+    Returns:
+        JSON object of the row with its source ("cache" or "redshift")
+    """
+    if table_name not in CACHE_TABLES:
+        return f"Unknown table '{table_name}'. Available tables: {', '.join(CACHE_TABLES)}"
+    
+    try:
+        row, source = cached_lookup(table_name, row_id)
+        if row is None:
+            return f"No row with id {row_id} in table '{table_name}'"
+        return json.dumps({"source": source, "row": row}, indent=2)
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+@mcp.tool()
+def redshift_warm_cache(table_name: str) -> str:
+    """
+    Load every row of a table from Redshift into the Redis cache.
+    
+    Args:
+        table_name: Name of the table (users, products, or orders)
+    
+    Returns:
+        Number of rows cached
+    """
+    if table_name not in CACHE_TABLES:
+        return f"Unknown table '{table_name}'. Available tables: {', '.join(CACHE_TABLES)}"
+    
+    try:
+        count = warm_cache(table_name)
+        return f"Cached {count} rows from '{table_name}' with TTL {CACHE_TTL}s"
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+@mcp.tool()
+def redshift_schema_overview(schema: str = "public", refresh: bool = False) -> str:
+    """
+    Summarize every table in a schema in one call: row counts, column types,
+    primary keys, foreign-key relationships and (on Redshift) dist/sort keys.
+    
+    Prefer this over calling redshift_describe_table once per table. Results
+    are cached for REDSHIFT_SCHEMA_CACHE_TTL seconds.
+    
+    Args:
+        schema: The schema name (default: "public")
+        refresh: Rebuild instead of using the cached overview (default: False)
+    
+    Returns:
+        Compact JSON overview of the schema
+    """
+    cached = _schema_cache.get(schema)
+    if cached and not refresh and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+        return cached[1]
+    
+    try:
+        overview = json.dumps(build_schema_overview(schema), separators=(",", ":"), default=str)
+        _schema_cache[schema] = (time.monotonic(), overview)
+        return overview
+    except Exception as e:
+        return f"Error: {str(e)}"
+
 # ============== MCP RESOURCES ==============
 
 @mcp.resource("redshift://tables")
@@ -159,6 +929,11 @@ def get_tables_resource() -> str:
     """List of available tables in the public schema."""
     return redshift_list_tables()
 
+@mcp.resource("redshift://schema")
+def get_schema_resource() -> str:
+    """Overview of tables, columns and relationships in the public schema."""
+    return redshift_schema_overview()
+
 @mcp.resource("redshift://status")
 def get_status_resource() -> str:
     """Current Redshift connection status."""
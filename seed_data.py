@@ -7,6 +7,7 @@ import os
 import sys
 from dotenv import load_dotenv
 import redis
+from redis_storage import ENCODINGS, clear_table, write_rows
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -24,6 +25,9 @@ redis_client = redis.Redis(
     decode_responses=True
 )
 
+# Row storage encoding: hash (default), packed or bucket. See redis_storage.py
+ROW_ENCODING = os.getenv("REDIS_ROW_ENCODING", "hash")
+
 # Sample Users
 USERS = [
     {"id": "1", "name": "Alice Johnson", "email": "alice@example.com", "role": "admin", "created": "2024-01-15"},
@@ -64,29 +68,23 @@ def seed_data():
         print(f"[ERROR] Failed to connect to Redis: {e}")
         return
     
-    # Seed users
-    print("\n[USERS] Adding users...")
-    for user in USERS:
-        key = f"user:{user['id']}"
-        redis_client.hset(key, mapping=user)
-        print(f"   Added {key}: {user['name']}")
-    
-    # Seed products
-    print("\n[PRODUCTS] Adding products...")
-    for product in PRODUCTS:
-        key = f"product:{product['id']}"
-        redis_client.hset(key, mapping=product)
-        print(f"   Added {key}: {product['name']}")
+    if ROW_ENCODING not in ENCODINGS:
+        print(f"[ERROR] Unknown REDIS_ROW_ENCODING '{ROW_ENCODING}'. Use one of: {', '.join(ENCODINGS)}")
+        return
+    print(f"[OK] Using '{ROW_ENCODING}' row encoding")
     
-    # Seed orders
-    print("\n[ORDERS] Adding orders...")
-    for order in ORDERS:
-        key = f"order:{order['id']}"
-        redis_client.hset(key, mapping=order)
-        print(f"   Added {key}: Order #{order['id']}")
+    for table_name, rows, label in [
+        ("users", USERS, "USERS"),
+        ("products", PRODUCTS, "PRODUCTS"),
+        ("orders", ORDERS, "ORDERS"),
+    ]:
+        print(f"\n[{label}] Adding {table_name}...")
+        clear_table(redis_client, table_name)
+        encoding = write_rows(redis_client, table_name, rows, ROW_ENCODING)
+        print(f"   Added {len(rows)} {table_name} ({encoding})")
     
     print("\n[DONE] Seeding complete!")
-    print(f"   Total keys created: {len(USERS) + len(PRODUCTS) + len(ORDERS)}")
+    print(f"   Total rows written: {len(USERS) + len(PRODUCTS) + len(ORDERS)}")
 
 
 if __name__ == "__main__":
@@ -19,6 +19,7 @@ from redis_mcp_server import (
     redis_keys,
     redis_list_tables,
     redis_query_table,
+    redis_get_row,
     redis_connection_status,
     get_connection_status
 )
@@ -55,6 +56,7 @@ def run_tests():
     print(f"HSET: {redis_hset('test:user', 'name', 'Test User')}")
     print(f"HSET: {redis_hset('test:user', 'email', 'test@example.com')}")
     print(f"HGETALL: {redis_hgetall('test:user')}")
+    print(f"HGETALL (paged): {redis_hgetall('test:user', count=1, stream=True)}")
     redis_delete('test:user')
     
     # Test 4: Keys Pattern
@@ -79,6 +81,10 @@ def run_tests():
     orders = redis_query_table('orders')
     print(orders)
     
+    print_section("9. Get Single Rows")
+    print(redis_get_row('users', '1'))
+    print(redis_get_row('orders', '3'))
+    
     print("\n[SUCCESS] All tests completed!\n")
     return True
 
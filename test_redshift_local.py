@@ -14,7 +14,13 @@ from redshift_mcp_server import (
     redshift_list_tables,
     redshift_describe_table,
     redshift_get_sample_data,
-    redshift_connection_status
+    redshift_connection_status,
+    redshift_list_rollups,
+    redshift_refresh_rollups,
+    redshift_lookup,
+    redshift_warm_cache,
+    redshift_schema_overview,
+    ROLLUPS
 )
 
 def print_section(title: str):
@@ -51,6 +57,26 @@ def run_tests():
     print_section("5. Custom SQL Query")
     sql = "SELECT category, COUNT(*) as count FROM products GROUP BY category"
     print(redshift_query(sql))
+    print(redshift_query("SELECT * FROM orders ORDER BY id", max_rows=2))
+    
+    # Test 6: Rollups
+    print_section("6. Build Rollups")
+    print(redshift_refresh_rollups())
+    print(redshift_list_rollups())
+    
+    print_section("7. Query Answered From Rollup")
+    print(redshift_query(ROLLUPS["revenue_by_category"]["sql"] + " ORDER BY revenue DESC"))
+    
+    # Test 8: Read-through cache
+    print_section("8. Cached Lookups")
+    print(redshift_lookup("users", 1))
+    print(redshift_lookup("users", 1))
+    print(redshift_warm_cache("products"))
+    print(redshift_lookup("products", 3))
+    
+    # Test 9: Schema overview
+    print_section("9. Schema Overview")
+    print(redshift_schema_overview())
     
     print("\n[SUCCESS] All tests completed!\n")
     return True